@@ -1,12 +1,12 @@
+import sys
 import os
-import google.generativeai as genai
-from dotenv import load_dotenv
+# Add the parent directory to sys.path to allow importing from backend
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Explicitly load .env from the project root
-dotenv_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
-load_dotenv(dotenv_path)
+import google.generativeai as genai
+from backend.config import get_settings
 
-api_key = os.getenv("GEMINI_API_KEY")
+api_key = get_settings().gemini_api_key
 print(f"API Key found: {bool(api_key)}")
 
 if api_key:
@@ -1,25 +1,35 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, literal, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, raiseload, selectinload
 from sqlalchemy.sql import func
-from datetime import date
+from datetime import date, datetime
 from . import models, schemas
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def get_user(db: Session, user_id: int):
-    return db.query(models.User).filter(models.User.id == user_id).first()
+    return db.get(models.User, user_id)
 
 def get_user_by_email(db: Session, email: str):
     return db.query(models.User).filter(models.User.email == email).first()
 
-def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password = pwd_context.hash(user.password)
-    db_user = models.User(email=user.email, hashed_password=hashed_password)
-    db.add(db_user)
+def create_user(db: Session, user: schemas.UserCreate, hashed_password: str):
+    # Returns None if the email is already registered (unique index on email)
+    stmt = (
+        pg_insert(models.User)
+        .values(email=user.email, hashed_password=hashed_password)
+        .on_conflict_do_nothing(index_elements=["email"])
+        .returning(models.User)
+    )
+    db_user = db.execute(stmt).scalar_one_or_none()
+    if db_user:
+        db.expunge(db_user)
     db.commit()
-    db.refresh(db_user)
     return db_user
 
+def update_user_password_hash(db: Session, user: models.User, hashed_password: str):
+    user.hashed_password = hashed_password
+    db.commit()
+    return user
+
 def create_chat_session(db: Session, user_id: int, title: str = "New Chat"):
     db_session = models.ChatSession(user_id=user_id, title=title)
     db.add(db_session)
@@ -27,16 +37,40 @@ def create_chat_session(db: Session, user_id: int, title: str = "New Chat"):
     db.refresh(db_session)
     return db_session
 
+def chat_session_sort_key():
+    # Sessions without messages have no updated_at yet, fall back to creation time
+    return func.coalesce(models.ChatSession.updated_at, models.ChatSession.created_at)
+
+def chat_session_list_options():
+    # The response schema embeds messages; load them in one batched query and
+    # fail loudly on any other lazy load instead of issuing one SELECT per row
+    return selectinload(models.ChatSession.messages), raiseload("*")
+
 def get_chat_sessions(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.ChatSession).filter(
+    return db.query(models.ChatSession).options(*chat_session_list_options()).filter(
         models.ChatSession.user_id == user_id
-    ).order_by(models.ChatSession.updated_at.desc()).offset(skip).limit(limit).all()
+    ).order_by(chat_session_sort_key().desc(), models.ChatSession.id.desc()).offset(skip).limit(limit).all()
+
+def get_chat_sessions_keyset(db: Session, user_id: int, cursor_ts: datetime | None = None, cursor_id: int | None = None, limit: int = 100):
+    sort_key = chat_session_sort_key()
+    q = db.query(models.ChatSession).options(*chat_session_list_options()).filter(models.ChatSession.user_id == user_id)
+    if cursor_id is not None:
+        q = q.filter(
+            tuple_(sort_key, models.ChatSession.id) < tuple_(literal(cursor_ts, models.ChatSession.created_at.type), cursor_id)
+        )
+    rows = q.order_by(sort_key.desc(), models.ChatSession.id.desc()).limit(limit).all()
+    next_cursor = None
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        next_cursor = (last.updated_at or last.created_at, last.id)
+    return rows, next_cursor
 
 def get_chat_session(db: Session, session_id: int, user_id: int):
-    return db.query(models.ChatSession).filter(
-        models.ChatSession.id == session_id,
-        models.ChatSession.user_id == user_id
-    ).first()
+    # Primary-key lookup goes through the identity map before hitting the DB
+    db_session = db.get(models.ChatSession, session_id)
+    if db_session is None or db_session.user_id != user_id:
+        return None
+    return db_session
 
 def update_chat_session(db: Session, session_id: int, user_id: int, title: str):
     db_session = get_chat_session(db, session_id, user_id)
@@ -53,17 +87,24 @@ def delete_chat_session(db: Session, session_id: int, user_id: int):
         db.commit()
     return db_session
 
-def create_chat_message(db: Session, message: schemas.ChatMessageCreate, session_id: int):
+def add_chat_message(db: Session, message: schemas.ChatMessageCreate, session_id: int):
     # Exclude 'context' if it exists in the schema, as it's not a DB column
-    message_data = message.dict(exclude={'context'}) if hasattr(message, 'dict') else message.dict()
+    message_data = message.model_dump(exclude={'context'})
     db_message = models.ChatMessage(**message_data, session_id=session_id)
     db.add(db_message)
-    
-    # Update session updated_at
-    db_session = db.query(models.ChatSession).filter(models.ChatSession.id == session_id).first()
-    if db_session:
-        db_session.updated_at = func.now()
-        
+    return db_message
+
+def touch_chat_session(db: Session, session_id: int):
+    # Update session updated_at without loading the session
+    db.execute(
+        update(models.ChatSession)
+        .where(models.ChatSession.id == session_id)
+        .values(updated_at=func.now())
+    )
+
+def create_chat_message(db: Session, message: schemas.ChatMessageCreate, session_id: int):
+    db_message = add_chat_message(db, message, session_id)
+    touch_chat_session(db, session_id)
     db.commit()
     db.refresh(db_message)
     return db_message
@@ -71,7 +112,17 @@ def create_chat_message(db: Session, message: schemas.ChatMessageCreate, session
 def get_chat_messages(db: Session, session_id: int, skip: int = 0, limit: int = 100):
     return db.query(models.ChatMessage).filter(
         models.ChatMessage.session_id == session_id
-    ).order_by(models.ChatMessage.timestamp.asc()).offset(skip).limit(limit).all()
+    ).order_by(models.ChatMessage.timestamp.asc(), models.ChatMessage.id.asc()).offset(skip).limit(limit).all()
+
+def get_chat_messages_keyset(db: Session, session_id: int, cursor_ts: datetime | None = None, cursor_id: int | None = None, limit: int = 100):
+    q = db.query(models.ChatMessage).filter(models.ChatMessage.session_id == session_id)
+    if cursor_id is not None:
+        q = q.filter(
+            tuple_(models.ChatMessage.timestamp, models.ChatMessage.id) > tuple_(literal(cursor_ts, models.ChatMessage.timestamp.type), cursor_id)
+        )
+    rows = q.order_by(models.ChatMessage.timestamp.asc(), models.ChatMessage.id.asc()).limit(limit).all()
+    next_cursor = (rows[-1].timestamp, rows[-1].id) if rows and len(rows) == limit else None
+    return rows, next_cursor
 
 def get_journal_entry(db: Session, entry_date: date, user_id: int):
     return db.query(models.JournalEntry).filter(
@@ -80,36 +131,77 @@ def get_journal_entry(db: Session, entry_date: date, user_id: int):
     ).first()
 
 def get_journal_entries(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.JournalEntry).filter(
+    return db.query(models.JournalEntry).options(raiseload("*")).filter(
         models.JournalEntry.owner_id == user_id
-    ).offset(skip).limit(limit).all()
+    ).order_by(models.JournalEntry.id.desc()).offset(skip).limit(limit).all()
+
+def get_journal_entries_keyset(db: Session, user_id: int, cursor_id: int | None = None, limit: int = 100):
+    q = db.query(models.JournalEntry).options(raiseload("*")).filter(models.JournalEntry.owner_id == user_id)
+    if cursor_id is not None:
+        q = q.filter(models.JournalEntry.id < cursor_id)
+    rows = q.order_by(models.JournalEntry.id.desc()).limit(limit).all()
+    next_cursor = rows[-1].id if rows and len(rows) == limit else None
+    return rows, next_cursor
 
 def create_journal_entry(db: Session, entry: schemas.JournalEntryCreate, user_id: int):
-    # Check if entry already exists for this date
-    existing_entry = get_journal_entry(db, entry.date, user_id)
-    if existing_entry:
-        return existing_entry
-        
-    db_entry = models.JournalEntry(**entry.dict(), owner_id=user_id)
-    db.add(db_entry)
+    # Atomic insert-if-absent on the (owner_id, date) unique index; returns None
+    # if the user already has an entry for this date
+    stmt = (
+        pg_insert(models.JournalEntry)
+        .values(**entry.model_dump(), owner_id=user_id)
+        .on_conflict_do_nothing(index_elements=["owner_id", "date"])
+        .returning(models.JournalEntry)
+    )
+    db_entry = db.execute(stmt).scalar_one_or_none()
+    if db_entry:
+        # RETURNING already loaded every column; detach so commit doesn't expire them
+        db.expunge(db_entry)
     db.commit()
-    db.refresh(db_entry)
     return db_entry
 
+def create_journal_entries(db: Session, entries: list[schemas.JournalEntryCreate], user_id: int):
+    # Bulk version of create_journal_entry: one INSERT for the whole batch, dates
+    # the user already has (or that repeat within the batch) are skipped
+    if not entries:
+        return []
+    stmt = (
+        pg_insert(models.JournalEntry)
+        .values([{**entry.model_dump(), "owner_id": user_id} for entry in entries])
+        .on_conflict_do_nothing(index_elements=["owner_id", "date"])
+        .returning(models.JournalEntry)
+    )
+    db_entries = db.execute(stmt).scalars().all()
+    for db_entry in db_entries:
+        db.expunge(db_entry)
+    db.commit()
+    return db_entries
+
 def update_journal_entry(db: Session, entry_date: date, entry_update: schemas.JournalEntryUpdate, user_id: int):
-    db_entry = get_journal_entry(db, entry_date, user_id)
+    update_data = entry_update.model_dump(exclude_unset=True)
+    if not update_data:
+        return get_journal_entry(db, entry_date, user_id)
+
+    stmt = (
+        update(models.JournalEntry)
+        .where(models.JournalEntry.date == entry_date, models.JournalEntry.owner_id == user_id)
+        .values(**update_data)
+        .returning(models.JournalEntry)
+    )
+    db_entry = db.execute(stmt).scalar_one_or_none()
     if db_entry:
-        update_data = entry_update.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_entry, key, value)
-        db.commit()
-        db.refresh(db_entry)
+        # RETURNING already loaded every column; detach so commit doesn't expire them
+        db.expunge(db_entry)
+    db.commit()
     return db_entry
 
 def delete_journal_entry(db: Session, entry_date: date, user_id: int):
-    db_entry = get_journal_entry(db, entry_date, user_id)
+    stmt = (
+        delete(models.JournalEntry)
+        .where(models.JournalEntry.date == entry_date, models.JournalEntry.owner_id == user_id)
+        .returning(models.JournalEntry)
+    )
+    db_entry = db.execute(stmt).scalar_one_or_none()
     if db_entry:
-        db.delete(db_entry)
-        db.commit()
+        db.expunge(db_entry)
+    db.commit()
     return db_entry
-
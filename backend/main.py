@@ -1,32 +1,52 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from pydantic import ValidationError
+from datetime import date, datetime, timedelta, timezone
 from typing import Annotated
 from . import models, crud, schemas
+from .config import get_settings
 from .database import SessionLocal, engine
-from passlib.context import CryptContext
-from jose import JWTError, jwt
+from .security import verify_and_update_password, get_password_hash
+import jwt
+from jwt import InvalidTokenError
 import os
+import json
+import time
+import asyncio
+import concurrent.futures
+import weakref
+from cachetools import LRUCache, TTLCache
 import google.generativeai as genai
-from dotenv import load_dotenv
 
-# Explicitly load .env from the project root
-dotenv_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
-load_dotenv(dotenv_path)
+settings = get_settings()
 
 # Configure Gemini
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+if settings.gemini_api_key:
+    genai.configure(api_key=settings.gemini_api_key)
     model = genai.GenerativeModel('gemini-2.5-flash')
 else:
     print("Warning: GEMINI_API_KEY not found in environment variables")
     model = None
 
-# Create tables
-models.Base.metadata.create_all(bind=engine)
+# Formatted Gemini history per chat session, appended to as messages are saved
+# so a turn doesn't re-read the whole conversation. The cache is per process:
+# with several uvicorn workers a session should stick to one worker.
+HISTORY_CACHE = LRUCache(maxsize=1000)
+# Serializes turns within a session; entries vanish once no request holds them
+HISTORY_LOCKS = weakref.WeakValueDictionary()
+# Live Gemini chat objects per session, which track history themselves, so a turn
+# only sends the new message instead of rebuilding the conversation client-side
+GEMINI_SESSIONS = LRUCache(maxsize=1000)
+
+# Schema is managed by Alembic migrations at deploy time; creating tables on
+# startup is opt-in for local development only
+if settings.auto_create_tables:
+    models.Base.metadata.create_all(bind=engine)
 
 app = FastAPI(title="Calling Journal API")
 
@@ -37,16 +57,37 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Link"], # Pagination cursors are advertised via Link: rel="next"
 )
 
+# Entry lists and chat histories are mostly prose and compress well
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Auth Configuration
-SECRET_KEY = "your-secret-key-keep-it-secret" # In production, use env var
+SECRET_KEY = settings.secret_key
+if not SECRET_KEY:
+    raise RuntimeError("SECRET_KEY must be set to sign access tokens")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRES = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+# Built once rather than per request on the auth hot path
+_ALGORITHMS = [ALGORITHM]
+_DEFAULT_EXP = timedelta(minutes=15)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Raw bearer token -> (detached User, token exp). Entries live at most 60s and
+# never past the token's own expiry, so most requests skip the decode + user lookup.
+TOKEN_CACHE = TTLCache(maxsize=10_000, ttl=60)
+
+# Password hashing is CPU-bound, so it runs in worker processes to use every core.
+# At most HASH_BACKLOG jobs may be in flight; further callers wait up to
+# HASH_QUEUE_TIMEOUT seconds for a slot before we shed load with a 503.
+HASH_POOL_WORKERS = os.cpu_count() or 1
+HASH_POOL = concurrent.futures.ProcessPoolExecutor(max_workers=HASH_POOL_WORKERS)
+HASH_BACKLOG = asyncio.BoundedSemaphore(HASH_POOL_WORKERS * 2)
+HASH_QUEUE_TIMEOUT = 5
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -55,36 +96,75 @@ def get_db():
     finally:
         db.close()
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def run_hash_job(fn, *args):
+    try:
+        await asyncio.wait_for(HASH_BACKLOG.acquire(), HASH_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="Server is busy, please try again")
+    try:
+        return await asyncio.get_running_loop().run_in_executor(HASH_POOL, fn, *args)
+    finally:
+        HASH_BACKLOG.release()
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
+    expire = datetime.now(timezone.utc) + (expires_delta or _DEFAULT_EXP)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+# Upper bound for the limit query param on list endpoints
+MAX_PAGE_SIZE = 1000
+
+def encode_cursor(ts: datetime, row_id: int) -> str:
+    return f"{ts.isoformat()}|{row_id}"
+
+def decode_cursor(cursor: str):
+    try:
+        ts, row_id = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def set_next_link(request: Request, response: Response, cursor):
+    if cursor is not None:
+        next_url = request.url.remove_query_params("skip").include_query_params(cursor=cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+
+# Returned as-is, so FastAPI skips response_model validation for these rows
+def rows_response(request: Request, rows: list, cursor=None):
+    response = Response(schemas.encode_rows(rows), media_type="application/json")
+    set_next_link(request, response, cursor)
+    return response
+
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_db)):
+    cached = TOKEN_CACHE.get(token)
+    if cached is not None:
+        user, expires_at = cached
+        if expires_at > time.time():
+            return user
+        TOKEN_CACHE.pop(token, None)
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=_ALGORITHMS)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
         token_data = schemas.TokenData(email=email)
-    except JWTError:
+    except InvalidTokenError:
         raise credentials_exception
-    user = crud.get_user_by_email(db, email=token_data.email)
+    # Cache miss: look the user up off the event loop
+    user = await asyncio.to_thread(crud.get_user_by_email, db, email=token_data.email)
     if user is None:
         raise credentials_exception
+    # Detach so commits later in this request can't expire the cached instance
+    db.expunge(user)
+    TOKEN_CACHE[token] = (user, payload["exp"])
     return user
 
 @app.get("/")
@@ -96,24 +176,35 @@ def health_check():
     return {"status": "healthy"}
 
 @app.post("/register", response_model=schemas.User)
-def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = crud.get_user_by_email(db, email=user.email)
+async def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
+    # DB calls go through to_thread so they don't block the event loop
+    db_user = await asyncio.to_thread(crud.get_user_by_email, db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return crud.create_user(db=db, user=user)
+    hashed_password = await run_hash_job(get_password_hash, user.password)
+    db_user = await asyncio.to_thread(crud.create_user, db=db, user=user, hashed_password=hashed_password)
+    if db_user is None:
+        # Lost a race with a concurrent registration for the same email
+        raise HTTPException(status_code=400, detail="Email already registered")
+    return db_user
 
 @app.post("/token", response_model=schemas.Token)
-def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: Session = Depends(get_db)):
-    user = crud.get_user_by_email(db, email=form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: Session = Depends(get_db)):
+    user = await asyncio.to_thread(crud.get_user_by_email, db, email=form_data.username)
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await run_hash_job(verify_and_update_password, form_data.password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    if new_hash:
+        # Transparently migrate legacy bcrypt hashes to argon2
+        await asyncio.to_thread(crud.update_user_password_hash, db, user, new_hash)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email}, expires_delta=ACCESS_TOKEN_EXPIRES
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -123,70 +214,105 @@ def create_entry(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    db_entry = crud.get_journal_entry(db, entry_date=entry.date, user_id=current_user.id)
-    if db_entry:
+    db_entry = crud.create_journal_entry(db=db, entry=entry, user_id=current_user.id)
+    if db_entry is None:
         raise HTTPException(status_code=400, detail="Entry already exists for this date")
-    return crud.create_journal_entry(db=db, entry=entry, user_id=current_user.id)
+    return db_entry
+
+# Bodies above this are rejected before they are read or parsed
+MAX_BATCH_BODY_BYTES = 5 * 1024 * 1024
+
+# The body is read from the raw request, so document it by hand; refs point at
+# the JournalEntryCreate component that POST /entries/ already registers
+_batch_schema = schemas.JOURNAL_LIST_ADAPTER.json_schema(ref_template="#/components/schemas/{model}")
+_batch_schema.pop("$defs", None)
+BATCH_ENTRIES_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": _batch_schema,
+            },
+        },
+    },
+}
+
+@app.post("/entries/batch", response_model=list[schemas.JournalEntry], openapi_extra=BATCH_ENTRIES_BODY)
+async def create_entries_batch(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    too_large = HTTPException(status_code=413, detail=f"Request body exceeds {MAX_BATCH_BODY_BYTES} bytes")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_BATCH_BODY_BYTES:
+        raise too_large
+    # Enforce the cap while reading too, for chunked bodies without a length
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_BATCH_BODY_BYTES:
+            raise too_large
+
+    # Body is a JSON array of entries, parsed and validated in one pass
+    try:
+        entries = schemas.JOURNAL_LIST_ADAPTER.validate_json(bytes(body))
+    except ValidationError as e:
+        # Match FastAPI's own body errors, whose locs start with "body"
+        errors = [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        raise RequestValidationError(errors, body=None)
+
+    # Returns only the entries that were created
+    db_entries = await asyncio.to_thread(crud.create_journal_entries, db, entries, current_user.id)
+    return rows_response(request, [schemas.JournalEntryRow.from_orm(e) for e in db_entries])
 
 @app.get("/entries/", response_model=list[schemas.JournalEntry])
 def read_entries(
+    request: Request,
     skip: int = 0, 
-    limit: int = 100, 
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: int | None = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    entries = crud.get_journal_entries(db, user_id=current_user.id, skip=skip, limit=limit)
-    return entries
+    # Legacy offset paging, kept for existing clients
+    next_cursor = None
+    if skip:
+        entries = crud.get_journal_entries(db, user_id=current_user.id, skip=skip, limit=limit)
+    else:
+        entries, next_cursor = crud.get_journal_entries_keyset(db, user_id=current_user.id, cursor_id=cursor, limit=limit)
+    return rows_response(request, [schemas.JournalEntryRow.from_orm(e) for e in entries], next_cursor)
 
 @app.get("/entries/{entry_date}", response_model=schemas.JournalEntry)
 def read_entry(
-    entry_date: str, 
+    entry_date: date,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    # Parse date string to date object
-    from datetime import datetime
-    try:
-        date_obj = datetime.strptime(entry_date, "%Y-%m-%d").date()
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
-        
-    db_entry = crud.get_journal_entry(db, entry_date=date_obj, user_id=current_user.id)
+    db_entry = crud.get_journal_entry(db, entry_date=entry_date, user_id=current_user.id)
     if db_entry is None:
         raise HTTPException(status_code=404, detail="Entry not found")
     return db_entry
 
 @app.put("/entries/{entry_date}", response_model=schemas.JournalEntry)
 def update_entry(
-    entry_date: str, 
+    entry_date: date,
     entry: schemas.JournalEntryUpdate, 
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    from datetime import datetime
-    try:
-        date_obj = datetime.strptime(entry_date, "%Y-%m-%d").date()
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
-        
-    db_entry = crud.update_journal_entry(db, entry_date=date_obj, entry_update=entry, user_id=current_user.id)
+    db_entry = crud.update_journal_entry(db, entry_date=entry_date, entry_update=entry, user_id=current_user.id)
     if db_entry is None:
         raise HTTPException(status_code=404, detail="Entry not found")
     return db_entry
 
 @app.delete("/entries/{entry_date}", response_model=schemas.JournalEntry)
 def delete_entry(
-    entry_date: str, 
+    entry_date: date,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    from datetime import datetime
-    try:
-        date_obj = datetime.strptime(entry_date, "%Y-%m-%d").date()
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
-        
-    db_entry = crud.delete_journal_entry(db, entry_date=date_obj, user_id=current_user.id)
+    db_entry = crud.delete_journal_entry(db, entry_date=entry_date, user_id=current_user.id)
     if db_entry is None:
         raise HTTPException(status_code=404, detail="Entry not found")
     return db_entry
@@ -201,10 +327,23 @@ def create_chat_session(
 
 @app.get("/chat/sessions", response_model=list[schemas.ChatSession])
 def get_chat_sessions(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return crud.get_chat_sessions(db, current_user.id)
+    if skip:
+        sessions = crud.get_chat_sessions(db, current_user.id, skip=skip, limit=limit)
+    else:
+        cursor_ts, cursor_id = decode_cursor(cursor) if cursor else (None, None)
+        sessions, next_cursor = crud.get_chat_sessions_keyset(
+            db, current_user.id, cursor_ts=cursor_ts, cursor_id=cursor_id, limit=limit
+        )
+        set_next_link(request, response, next_cursor and encode_cursor(*next_cursor))
+    return [schemas.ChatSession.from_orm_fast(s) for s in sessions]
 
 @app.get("/chat/sessions/{session_id}", response_model=schemas.ChatSession)
 def get_chat_session(
@@ -218,16 +357,81 @@ def get_chat_session(
     return session
 
 @app.delete("/chat/sessions/{session_id}")
-def delete_chat_session(
+async def delete_chat_session(
     session_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    session = crud.delete_chat_session(db, session_id, current_user.id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+    # Async so the cache pops happen on the event loop like every other cache
+    # access (LRUCache isn't thread-safe), and under the session lock so a turn
+    # in progress finishes before the session goes away
+    async with history_lock(session_id):
+        session = await asyncio.to_thread(crud.delete_chat_session, db, session_id, current_user.id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        HISTORY_CACHE.pop(session_id, None)
+        GEMINI_SESSIONS.pop(session_id, None)
     return {"status": "success"}
 
+def load_chat_history(db: Session, session_id: int):
+    history = crud.get_chat_messages(db, session_id)
+    chat_history = []
+    for msg in history:
+        role = "user" if msg.role == "user" else "model"
+        chat_history.append({"role": role, "parts": [msg.content]})
+    return chat_history
+
+def get_cached_history(db: Session, session_id: int):
+    chat_history = HISTORY_CACHE.get(session_id)
+    if chat_history is None:
+        chat_history = HISTORY_CACHE[session_id] = load_chat_history(db, session_id)
+    return chat_history
+
+def get_gemini_session(session_id: int, chat_history: list[dict]):
+    chat_session = GEMINI_SESSIONS.get(session_id)
+    if chat_session is None:
+        chat_session = GEMINI_SESSIONS[session_id] = model.start_chat(history=list(chat_history))
+    return chat_session
+
+def history_lock(session_id: int):
+    lock = HISTORY_LOCKS.get(session_id)
+    if lock is None:
+        lock = HISTORY_LOCKS[session_id] = asyncio.Lock()
+    return lock
+
+def build_prompt(message: schemas.ChatMessageCreate):
+    if message.context:
+        return f"Context:\n{message.context}\n\nUser Message: {message.content}"
+    return message.content
+
+def drop_prompt_context(chat_session, message: schemas.ChatMessageCreate):
+    # The pooled session records the full prompt; keep only the bare message so
+    # old copies of the context aren't resent every turn and the history matches
+    # what a session rebuilt from HISTORY_CACHE would hold
+    if message.context:
+        history = chat_session.history
+        chat_session.history = history[:-2] + [{"role": "user", "parts": [message.content]}, history[-1]]
+
+def save_streamed_reply(session_id: int, ai_response_text: str):
+    # Runs after the request has finished, so it can't reuse the request's session
+    db = SessionLocal()
+    try:
+        ai_msg_schema = schemas.ChatMessageCreate(role="model", content=ai_response_text)
+        crud.create_chat_message(db, ai_msg_schema, session_id)
+    finally:
+        db.close()
+
+async def persist_streamed_reply(session_id: int, ai_response_text: str):
+    await asyncio.to_thread(save_streamed_reply, session_id, ai_response_text)
+    async with history_lock(session_id):
+        # A JSON turn may have run while we streamed, so appending here could put
+        # the reply out of order; rebuild both from the DB on the next turn instead
+        HISTORY_CACHE.pop(session_id, None)
+        GEMINI_SESSIONS.pop(session_id, None)
+
+# Strong refs to in-flight reply saves, which outlive the stream that started them
+PENDING_SAVES = set()
+
 @app.post("/chat/{session_id}", response_model=schemas.ChatMessage)
 async def chat(
     session_id: int,
@@ -243,38 +447,106 @@ async def chat(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    # Save user message
-    crud.create_chat_message(db, message, session_id)
-    
-    try:
-        # Get chat history for context
-        history = crud.get_chat_messages(db, session_id)
-        chat_history = []
-        for msg in history:
-            role = "user" if msg.role == "user" else "model"
-            chat_history.append({"role": role, "parts": [msg.content]})
-            
-        # Generate AI response with history
-        prompt = message.content
-        if message.context:
-            prompt = f"Context:\n{message.context}\n\nUser Message: {message.content}"
-            
-        chat_session = model.start_chat(history=chat_history)
-        response = chat_session.send_message(prompt)
-        ai_response_text = response.text
-        
-        # Save AI response
+    async with history_lock(session_id):
+        chat_history = get_cached_history(db, session_id)
+        chat_session = get_gemini_session(session_id, chat_history)
+
+        try:
+            # Generate AI response; the pooled chat session already holds the history
+            # send_message blocks for the whole LLM round trip; keep it off the event loop
+            response = await asyncio.to_thread(chat_session.send_message, build_prompt(message))
+            ai_response_text = response.text
+            drop_prompt_context(chat_session, message)
+        except Exception as e:
+            print(f"Error in chat endpoint: {str(e)}")
+            # Rebuild the Gemini session from saved history on the next turn
+            GEMINI_SESSIONS.pop(session_id, None)
+            # Keep the user's message even though no reply was generated
+            crud.create_chat_message(db, message, session_id)
+            chat_history.append({"role": "user", "parts": [message.content]})
+            raise HTTPException(status_code=500, detail=str(e))
+
+        # Save both messages and bump the session in a single transaction
+        crud.add_chat_message(db, message, session_id)
         ai_msg_schema = schemas.ChatMessageCreate(role="model", content=ai_response_text, session_id=session_id)
-        ai_msg = crud.create_chat_message(db, ai_msg_schema, session_id)
-        
+        ai_msg = crud.add_chat_message(db, ai_msg_schema, session_id)
+        crud.touch_chat_session(db, session_id)
+        db.commit()
+        db.refresh(ai_msg)
+
+        chat_history.append({"role": "user", "parts": [message.content]})
+        chat_history.append({"role": "model", "parts": [ai_response_text]})
         return ai_msg
+
+@app.post("/chat/{session_id}/stream")
+async def chat_stream(
+    session_id: int,
+    message: schemas.ChatMessageCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    # Same as /chat/{session_id}, but streams the reply as server-sent events
+    if not model:
+        raise HTTPException(status_code=503, detail="AI service not configured")
+
+    # Verify session ownership
+    session = crud.get_chat_session(db, session_id, current_user.id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    async with history_lock(session_id):
+        chat_history = get_cached_history(db, session_id)
+
+        # Save user message
+        crud.create_chat_message(db, message, session_id)
+        prior_history = list(chat_history)
+        chat_history.append({"role": "user", "parts": [message.content]})
+        # Streams use a one-off Gemini session, since the lock isn't held while
+        # streaming; the pooled one is rebuilt from history on the next turn
+        GEMINI_SESSIONS.pop(session_id, None)
+
+    try:
+        chat_session = model.start_chat(history=prior_history)
+        stream = await asyncio.to_thread(chat_session.send_message, build_prompt(message), stream=True)
     except Exception as e:
-        print(f"Error in chat endpoint: {str(e)}")
+        print(f"Error in chat stream endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def event_stream():
+        chunks = []
+        completed = False
+        chunk_iter = iter(stream)
+        try:
+            while True:
+                chunk = await asyncio.to_thread(next, chunk_iter, None)
+                if chunk is None:
+                    break
+                chunks.append(chunk.text)
+                yield f"data: {json.dumps({'text': chunk.text})}\n\n"
+            completed = True
+            yield "event: done\ndata: {}\n\n"
+        except Exception as e:
+            print(f"Error in chat stream endpoint: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        finally:
+            # Only a reply that streamed to the end is persisted; a disconnect
+            # or error midway leaves just the user message. The save runs as its
+            # own task so a disconnect right after "done" can't cancel it.
+            if completed and chunks:
+                task = asyncio.create_task(persist_streamed_reply(session_id, "".join(chunks)))
+                PENDING_SAVES.add(task)
+                task.add_done_callback(PENDING_SAVES.discard)
+                await asyncio.shield(task)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 @app.get("/chat/{session_id}/messages", response_model=list[schemas.ChatMessage])
 def get_chat_history(
     session_id: int,
+    request: Request,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
@@ -282,5 +554,17 @@ def get_chat_history(
     session = crud.get_chat_session(db, session_id, current_user.id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-        
-    return crud.get_chat_messages(db, session_id)
+
+    next_cursor = None
+    if skip:
+        messages = crud.get_chat_messages(db, session_id, skip=skip, limit=limit)
+    else:
+        cursor_ts, cursor_id = decode_cursor(cursor) if cursor else (None, None)
+        messages, next_cursor = crud.get_chat_messages_keyset(
+            db, session_id, cursor_ts=cursor_ts, cursor_id=cursor_id, limit=limit
+        )
+    return rows_response(
+        request,
+        [schemas.ChatMessageRow.from_orm(m) for m in messages],
+        next_cursor and encode_cursor(*next_cursor),
+    )
@@ -0,0 +1,83 @@
+"""baseline schema
+
+Revision ID: 0001_baseline
+Revises: 
+Create Date: 2026-10-15 00:00:00
+
+Matches the tables previously created by Base.metadata.create_all. Databases
+that already have them should be stamped at this revision instead of upgraded:
+
+    alembic -c backend/alembic.ini stamp 0001_baseline
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_baseline'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'chat_sessions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_chat_sessions_id', 'chat_sessions', ['id'])
+
+    op.create_table(
+        'chat_messages',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('role', sa.String(), nullable=True),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('session_id', sa.Integer(), sa.ForeignKey('chat_sessions.id'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_chat_messages_id', 'chat_messages', ['id'])
+
+    op.create_table(
+        'journal_entries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('mood', sa.String(), nullable=True),
+        sa.Column('duration', sa.String(), nullable=True),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('is_starred', sa.Boolean(), nullable=True),
+        sa.Column('is_hidden', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('owner_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_journal_entries_id', 'journal_entries', ['id'])
+    op.create_index('ix_journal_entries_date', 'journal_entries', ['date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('journal_entries')
+    op.drop_table('chat_messages')
+    op.drop_table('chat_sessions')
+    op.drop_table('users')
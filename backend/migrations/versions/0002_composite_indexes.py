@@ -0,0 +1,46 @@
+"""composite indexes for the hot per-user queries
+
+Revision ID: 0002_composite_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-15 00:00:01
+
+Fails if a user already has two journal entries on the same date; remove the
+duplicates before upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_composite_indexes'
+down_revision: Union[str, Sequence[str], None] = '0001_baseline'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_journal_entries_owner_id_date', 'journal_entries', ['owner_id', 'date'], unique=True
+    )
+    op.create_index(
+        'ix_journal_entries_owner_id_id', 'journal_entries', ['owner_id', sa.text('id DESC')]
+    )
+    op.create_index(
+        'ix_chat_messages_session_id_timestamp', 'chat_messages', ['session_id', 'timestamp', 'id']
+    )
+    op.create_index(
+        'ix_chat_sessions_user_id_activity',
+        'chat_sessions',
+        ['user_id', sa.text('coalesce(updated_at, created_at) DESC'), sa.text('id DESC')],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chat_sessions_user_id_activity', table_name='chat_sessions')
+    op.drop_index('ix_chat_messages_session_id_timestamp', table_name='chat_messages')
+    op.drop_index('ix_journal_entries_owner_id_id', table_name='journal_entries')
+    op.drop_index('ix_journal_entries_owner_id_date', table_name='journal_entries')
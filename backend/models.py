@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, Date, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -25,6 +25,11 @@ class ChatSession(Base):
     owner = relationship("User", back_populates="chat_sessions")
     messages = relationship("ChatMessage", back_populates="session", cascade="all, delete-orphan")
 
+    # Serves the per-user "most recently active first" listing
+    __table_args__ = (
+        Index("ix_chat_sessions_user_id_activity", user_id, func.coalesce(updated_at, created_at).desc(), id.desc()),
+    )
+
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
 
@@ -36,6 +41,9 @@ class ChatMessage(Base):
     session_id = Column(Integer, ForeignKey("chat_sessions.id"))
     session = relationship("ChatSession", back_populates="messages")
 
+    # Serves keyset pagination over a session's history
+    __table_args__ = (Index("ix_chat_messages_session_id_timestamp", session_id, timestamp, id),)
+
 class JournalEntry(Base):
     __tablename__ = "journal_entries"
 
@@ -53,3 +61,10 @@ class JournalEntry(Base):
     owner_id = Column(Integer, ForeignKey("users.id"))
     owner = relationship("User", back_populates="entries")
 
+    __table_args__ = (
+        # Serves keyset pagination over a user's entries
+        Index("ix_journal_entries_owner_id_id", owner_id, id.desc()),
+        # One entry per user per day; also serves the (owner_id, date) lookups
+        Index("ix_journal_entries_owner_id_date", owner_id, date, unique=True),
+    )
+
@@ -1,19 +1,60 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, TypeAdapter, create_model
 from datetime import date, datetime
-from typing import Optional
+from operator import attrgetter
+from typing import Annotated, Any, Callable, ClassVar, Final
+import msgspec
+import re
+
+class FastRowMixin(BaseModel):
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+        frozen=False,
+        validate_assignment=False,
+        arbitrary_types_allowed=False,
+    )
+
+    # Field names and a compiled attrgetter, stashed once per subclass
+    _FIELD_TUPLE: ClassVar[tuple[str, ...]] = ()
+    _FIELD_GETTER: ClassVar[Callable[[Any], tuple] | None] = None
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        super().__pydantic_init_subclass__(**kwargs)
+        fields = cls._FIELD_TUPLE = tuple(cls.model_fields)
+        if not fields:
+            cls._FIELD_GETTER = None
+        elif len(fields) == 1:
+            # attrgetter returns a bare value, not a tuple, for a single name
+            cls._FIELD_GETTER = lambda obj, get=attrgetter(fields[0]): (get(obj),)
+        else:
+            cls._FIELD_GETTER = attrgetter(*fields)
+
+    # Build from a trusted ORM row without running validation
+    @classmethod
+    def from_orm_fast(cls, obj):
+        fields = cls._FIELD_TUPLE
+        if not fields:
+            return cls.model_construct(_fields_set=set())
+        return cls.model_construct(_fields_set=set(fields), **dict(zip(fields, cls._FIELD_GETTER(obj))))
+
+# Cheap shape check in place of email-validator's full parse
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+").fullmatch
+
+def _check_email(v: str) -> str:
+    if not _EMAIL_RE(v):
+        raise ValueError("value is not a valid email address")
+    return v
 
 # User Schemas
 class UserBase(BaseModel):
-    email: EmailStr
+    email: Annotated[str, AfterValidator(_check_email)]
 
 class UserCreate(UserBase):
     password: str
 
-class User(UserBase):
+class User(UserBase, FastRowMixin):
     id: int
-    
-    class Config:
-        from_attributes = True
 
 # Chat Schemas
 class ChatMessageBase(BaseModel):
@@ -21,66 +62,112 @@ class ChatMessageBase(BaseModel):
     content: str
 
 class ChatMessageCreate(ChatMessageBase):
-    context: Optional[str] = None
+    context: str | None = None
 
-class ChatMessage(ChatMessageBase):
+class ChatMessage(ChatMessageBase, FastRowMixin):
     id: int
     timestamp: datetime
     session_id: int
 
-    class Config:
-        from_attributes = True
-
 class ChatSessionBase(BaseModel):
     title: str
 
 class ChatSessionCreate(ChatSessionBase):
     pass
 
-class ChatSession(ChatSessionBase):
+class ChatSession(ChatSessionBase, FastRowMixin):
     id: int
     created_at: datetime
-    updated_at: Optional[datetime]
+    updated_at: datetime | None
     user_id: int
-    messages: list[ChatMessage] = []
+    messages: list[ChatMessage] = Field(default_factory=list)
 
-    class Config:
-        from_attributes = True
+    @classmethod
+    def from_orm_fast(cls, obj):
+        session = super().from_orm_fast(obj)
+        session.messages = [ChatMessage.from_orm_fast(m) for m in obj.messages]
+        return session
 
 # Journal Entry Schemas
+_DEFAULT_TITLE: Final = "Journal Entry"
+_DEFAULT_MOOD: Final = "📝"
+
 class JournalEntryBase(BaseModel):
     date: date
-    title: Optional[str] = "Journal Entry"
-    mood: Optional[str] = "📝"
-    duration: Optional[str] = None
-    content: Optional[str] = None
-    is_starred: Optional[bool] = False
-    is_hidden: Optional[bool] = False
+    title: str | None = _DEFAULT_TITLE
+    mood: str | None = _DEFAULT_MOOD
+    duration: str | None = None
+    content: str | None = None
+    is_starred: bool | None = False
+    is_hidden: bool | None = False
 
 class JournalEntryCreate(JournalEntryBase):
     pass
 
-class JournalEntryUpdate(BaseModel):
-    title: Optional[str] = None
-    mood: Optional[str] = None
-    duration: Optional[str] = None
-    content: Optional[str] = None
-    is_starred: Optional[bool] = None
-    is_hidden: Optional[bool] = None
+MAX_BATCH_ENTRIES = 500
+
+# Built once; validates raw request bytes for bulk creates, with the batch
+# size enforced by the validator itself
+JOURNAL_LIST_ADAPTER = TypeAdapter(Annotated[list[JournalEntryCreate], Field(max_length=MAX_BATCH_ENTRIES)])
 
-class JournalEntry(JournalEntryBase):
+# Every editable field of JournalEntryBase, optional and defaulting to None
+JournalEntryUpdate = create_model(
+    "JournalEntryUpdate",
+    **{
+        name: (field.annotation | None, None)
+        for name, field in JournalEntryBase.model_fields.items()
+        if name != "date"
+    },
+)
+
+class JournalEntry(JournalEntryBase, FastRowMixin):
     id: int
     owner_id: int
     created_at: datetime
-    updated_at: Optional[datetime] = None
+    updated_at: datetime | None = None
+
+# msgspec structs for list responses built from trusted DB rows;
+# the BaseModel schemas above stay in use for request bodies and docs
+class ChatMessageRow(msgspec.Struct, gc=False, frozen=True):
+    id: int
+    role: str
+    content: str
+    timestamp: datetime
+    session_id: int
+
+    @classmethod
+    def from_orm(cls, obj):
+        return cls(*_CHAT_MESSAGE_ROW_GET(obj))
+
+class JournalEntryRow(msgspec.Struct, gc=False, frozen=True):
+    id: int
+    owner_id: int
+    date: date
+    title: str | None
+    mood: str | None
+    duration: str | None
+    content: str | None
+    is_starred: bool | None
+    is_hidden: bool | None
+    created_at: datetime
+    updated_at: datetime | None
+
+    @classmethod
+    def from_orm(cls, obj):
+        return cls(*_JOURNAL_ENTRY_ROW_GET(obj))
+
+_CHAT_MESSAGE_ROW_GET = attrgetter(*ChatMessageRow.__struct_fields__)
+_JOURNAL_ENTRY_ROW_GET = attrgetter(*JournalEntryRow.__struct_fields__)
+
+_ROW_ENCODER = msgspec.json.Encoder()
 
-    class Config:
-        from_attributes = True
+def encode_rows(rows: list) -> bytes:
+    return _ROW_ENCODER.encode(rows)
 
 class Token(BaseModel):
     access_token: str
     token_type: str
 
 class TokenData(BaseModel):
-    email: Optional[str] = None
+    email: str | None = None
 
@@ -0,0 +1,23 @@
+from passlib.context import CryptContext
+
+# Single shared hashing context for the whole backend. New hashes use argon2id
+# with the OWASP-recommended parameters; existing bcrypt hashes still verify and
+# are upgraded on the user's next successful login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__memory_cost=19456,
+    argon2__time_cost=2,
+    argon2__parallelism=1,
+)
+
+# Trigger passlib's lazy backend detection at startup instead of on the first login
+pwd_context.hash("warmup")
+
+# Module-level so the process pool can pickle them by reference
+def verify_and_update_password(plain_password, hashed_password):
+    # Returns (is_valid, new_hash); new_hash is set when the stored hash is outdated
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def get_password_hash(password):
+    return pwd_context.hash(password)